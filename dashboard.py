@@ -1,9 +1,25 @@
+import io
+import os
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import seaborn as sns
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg')  # headless backend; figures only ever become PNGs
+import matplotlib.pyplot as plt  # noqa: E402
+
+try:
+    from plotly_resampler import FigureResampler
+except ImportError:  # optional; only needed once traces outgrow the browser
+    FigureResampler = None
+
+try:
+    from numba import njit
+except ImportError:  # optional; only pays off once the dataset outgrows toy size
+    njit = None
 
 # --- 1. PAGE CONFIGURATION & THEME ---
 st.set_page_config(
@@ -23,113 +39,418 @@ st.markdown("""
 
 # --- 2. DATA ENGINE ---
 
+# Engineered dataset cached on disk so cold starts skip CSV parsing entirely
+PARQUET_PATH = 'train.parquet'
+ENGINEERED_COLS = ['year', 'month', 'day', 'hour', 'period',
+                   'season_label', 'weather_label', 'working_day_str']
+
+# Mappings for clear readability
+SEASON_MAP = {1: 'Spring', 2: 'Summer', 3: 'Fall', 4: 'Winter'}
+WEATHER_MAP = {1: 'Clear/Nice', 2: 'Cloudy/Mist',
+               3: 'Rain/Snow', 4: 'Extreme Weather'}
+WORKING_DAY_MAP = {0: 'Weekend/Holiday', 1: 'Work Day'}
+
+# Narrow dtypes up front: the groupby/corr work is memory-bound, so halving
+# the bytes per column speeds it up directly
+CSV_DTYPES = {'season': 'int8', 'holiday': 'int8', 'workingday': 'int8',
+              'weather': 'int8', 'humidity': 'int8',
+              'temp': 'float32', 'atemp': 'float32', 'windspeed': 'float32',
+              'casual': 'int32', 'registered': 'int32', 'count': 'int32'}
+
+# Ordering
+MONTH_ORDER = ['January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December']
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday',
+             'Thursday', 'Friday', 'Saturday', 'Sunday']
+PERIOD_ORDER = ['🌅 Morning Rush', '☀️ Mid-Day', '🌇 Evening Rush', '🌙 Night']
+
+
+def _finalize_categoricals(df):
+    df['month'] = pd.Categorical(
+        df['month'], categories=MONTH_ORDER, ordered=True)
+    df['day'] = pd.Categorical(df['day'], categories=DAY_ORDER, ordered=True)
+    df['period'] = pd.Categorical(
+        df['period'], categories=PERIOD_ORDER, ordered=True)
+    # int8-code comparisons in the filter masks and groupbys, not string hashes
+    df['season_label'] = df['season_label'].astype(
+        pd.CategoricalDtype(list(SEASON_MAP.values())))
+    df['weather_label'] = df['weather_label'].astype(
+        pd.CategoricalDtype(list(WEATHER_MAP.values())))
+    # Keep the frame time-sorted so date spans resolve as index slices
+    return df.sort_values('datetime', ignore_index=True)
+
+
+def _prep_with_polars():
+    # Multi-threaded CSV read + feature engineering in one expression pass
+    import polars as pl
+    pl_dtypes = {'int8': pl.Int8, 'int32': pl.Int32, 'float32': pl.Float32}
+    overrides = {col: pl_dtypes[dt] for col, dt in CSV_DTYPES.items()}
+    hour = pl.col('datetime').dt.hour()
+    lf = pl.scan_csv('train.csv', schema_overrides=overrides).with_columns(
+        pl.col('datetime').str.to_datetime()
+    ).with_columns(
+        pl.col('datetime').dt.year().alias('year'),
+        pl.col('datetime').dt.strftime('%B').alias('month'),
+        pl.col('datetime').dt.strftime('%A').alias('day'),
+        hour.alias('hour'),
+        pl.when(hour.is_between(5, 9)).then(pl.lit(PERIOD_ORDER[0]))
+          .when(hour.is_between(10, 14)).then(pl.lit(PERIOD_ORDER[1]))
+          .when(hour.is_between(15, 19)).then(pl.lit(PERIOD_ORDER[2]))
+          .otherwise(pl.lit(PERIOD_ORDER[3])).alias('period'),
+        pl.col('season').replace_strict(SEASON_MAP).alias('season_label'),
+        pl.col('weather').replace_strict(WEATHER_MAP).alias('weather_label'),
+        pl.col('workingday').replace_strict(
+            WORKING_DAY_MAP).alias('working_day_str'),
+    )
+    return _finalize_categoricals(lf.collect().to_pandas())
+
 
-@st.cache_data
-def load_and_prep_data():
-    df = pd.read_csv('train.csv')
+def _prep_with_pandas():
+    # Single-threaded fallback when Polars is not installed
+    df = pd.read_csv('train.csv', dtype=CSV_DTYPES)
     df['datetime'] = pd.to_datetime(df['datetime'])
 
     # Feature Engineering
     df['year'] = df['datetime'].dt.year
     df['month'] = df['datetime'].dt.month_name()
     df['day'] = df['datetime'].dt.day_name()
-    df['hour'] = df['datetime'].dt.hour
-
-    # Operational Periods (Creative Logic)
-    def get_period(h):
-        if 5 <= h < 10:
-            return '🌅 Morning Rush'
-        elif 10 <= h < 15:
-            return '☀️ Mid-Day'
-        elif 15 <= h < 20:
-            return '🌇 Evening Rush'
-        else:
-            return '🌙 Night'
-    df['period'] = df['hour'].apply(get_period)
-
-    # Mappings for clear readability
-    season_map = {1: 'Spring', 2: 'Summer', 3: 'Fall', 4: 'Winter'}
-    weather_map = {1: 'Clear/Nice', 2: 'Cloudy/Mist',
-                   3: 'Rain/Snow', 4: 'Extreme Weather'}
-    df['season_label'] = df['season'].map(season_map)
-    df['weather_label'] = df['weather'].map(weather_map)
-    df['working_day_str'] = df['workingday'].map(
-        {0: 'Weekend/Holiday', 1: 'Work Day'})
-
-    # Ordering
-    month_order = ['January', 'February', 'March', 'April', 'May', 'June',
-                   'July', 'August', 'September', 'October', 'November', 'December']
-    day_order = ['Monday', 'Tuesday', 'Wednesday',
-                 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    df['month'] = pd.Categorical(
-        df['month'], categories=month_order, ordered=True)
-    df['day'] = pd.Categorical(df['day'], categories=day_order, ordered=True)
+    df['hour'] = df['datetime'].dt.hour.astype('int8')
+
+    # Operational Periods (Creative Logic) - vectorized over the hour column
+    period_conds = [
+        df['hour'].between(5, 9),
+        df['hour'].between(10, 14),
+        df['hour'].between(15, 19),
+    ]
+    df['period'] = np.select(period_conds, PERIOD_ORDER[:3],
+                             default=PERIOD_ORDER[3])
+
+    df['season_label'] = df['season'].map(SEASON_MAP)
+    df['weather_label'] = df['weather'].map(WEATHER_MAP)
+    df['working_day_str'] = df['workingday'].map(WORKING_DAY_MAP)
+
+    return _finalize_categoricals(df)
+
+
+@st.cache_resource
+def load_and_prep_data():
+    """Engineered base frame, shared read-only across all sessions.
+
+    cache_resource hands every session the same object instead of a
+    per-session deep copy, so memory stays constant under concurrent users.
+    Nothing below may mutate it: derived columns belong in the per-filter
+    cached functions, which return fresh objects.
+    """
+    # Fast path: typed columnar read, all feature columns already materialized
+    if os.path.exists(PARQUET_PATH):
+        df = pd.read_parquet(PARQUET_PATH)
+        if (set(ENGINEERED_COLS).issubset(df.columns)
+                and df['season_label'].dtype == 'category'
+                and df['count'].dtype == 'int32'):
+            return df
+        # Stale cache from an older version of the pipeline; rebuild below
+
+    try:
+        df = _prep_with_polars()
+    except ImportError:
+        df = _prep_with_pandas()
+
+    # Persist for the next cold start (Parquet keeps the Categorical dtypes)
+    df.to_parquet(PARQUET_PATH)
 
     return df
 
 
 df = load_and_prep_data()
 
+CORR_COLS = ['temp', 'humidity', 'windspeed', 'count', 'casual', 'registered']
+
+# Above this many points per trace, ship LTTB-downsampled samples to the
+# browser instead of the full trace
+RESAMPLE_THRESHOLD = 1000
+
+
+def downsample_for_display(fig):
+    """LTTB-downsample big line/scatter figures; small ones pass through.
+
+    Today's traces are pre-aggregated (at most a few dozen points), so this
+    only kicks in if the dataset grows or a raw-points chart is added.
+    """
+    if FigureResampler is None:
+        return fig
+    n_points = max((len(trace.x) for trace in fig.data
+                    if trace.x is not None), default=0)
+    if n_points <= RESAMPLE_THRESHOLD:
+        return fig
+    return FigureResampler(fig, default_n_shown_samples=RESAMPLE_THRESHOLD)
+
+
+# Raster size for the temperature density view; cost is O(bins^2), not O(rows)
+TEMP_DENSITY_BINS = 60
+# Below this many rows, individual points are cheap enough to render directly
+SCATTER_MAX_POINTS = 2000
+
+
+def _corr_matrix(df_f):
+    # One BLAS matmul over a contiguous float32 block instead of pandas'
+    # column-at-a-time .corr() path
+    arr = np.ascontiguousarray(df_f[CORR_COLS].to_numpy(dtype=np.float32))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cm = np.corrcoef(arr, rowvar=False)
+    return pd.DataFrame(cm, index=CORR_COLS, columns=CORR_COLS)
+
+
+def _temp_density(df_f):
+    hist, temp_edges, count_edges = np.histogram2d(
+        df_f['temp'].to_numpy(dtype='float32'),
+        df_f['count'].to_numpy(dtype='float32'),
+        bins=TEMP_DENSITY_BINS)
+    hist = hist.T  # rows = count axis, as go.Heatmap expects
+    hist[hist == 0] = np.nan  # keep empty bins transparent
+    return hist, temp_edges, count_edges
+
+
+def _fig_to_png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=100, bbox_inches='tight')
+    plt.close(fig)
+    return buf.getvalue()
+
+
+@st.cache_data
+def weather_bar_png(weather_season):
+    """Static weather/season bar chart as PNG bytes, memoized on the small
+    aggregate frame so Matplotlib only renders unseen filter states."""
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(
+        data=weather_season, x='weather_label', y='count',
+        hue='season_label', palette="viridis", ax=ax, errorbar=None
+    )
+    ax.set_ylabel("Total Rentals")
+    ax.set_xlabel("")
+    ax.legend(title="Season")
+    sns.despine(fig)
+    return _fig_to_png(fig)
+
+
+@st.cache_data
+def corr_heatmap_png(corr):
+    """Static correlation heatmap as PNG bytes, memoized like the bar chart."""
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.heatmap(corr, annot=True, cmap="coolwarm", fmt=".2f", ax=ax)
+    return _fig_to_png(fig)
+
+
+@st.cache_data
+def get_filtered(years, seasons):
+    """Filtered view of the base frame, memoized per widget state.
+
+    `years`/`seasons` must be tuples so Streamlit can hash them; the base
+    frame is closed over from module scope.
+    """
+    # The frame is datetime-sorted, so a contiguous year span is resolved
+    # with two O(log n) searchsorted lookups into a zero-copy slice instead
+    # of a full-column comparison.
+    year_span = sorted(set(years))
+    if year_span and year_span == list(range(year_span[0], year_span[-1] + 1)):
+        bounds = np.array([f'{year_span[0]}-01-01',
+                           f'{year_span[-1] + 1}-01-01'], dtype='datetime64[ns]')
+        i0, i1 = np.searchsorted(df['datetime'].to_numpy(), bounds)
+        df_slice = df.iloc[i0:i1]
+    else:
+        df_slice = df[df['year'].isin(years)]
+
+    # "All seasons" is the default widget state: the predicate is a tautology,
+    # so skip building a mask at all
+    if set(seasons) >= set(SEASON_MAP.values()):
+        return df_slice
+
+    # Remaining predicates only scan the slice. Membership is checked on the
+    # int8 category codes, not the label strings, so the scan never hashes.
+    season_cat = df_slice['season_label'].cat
+    season_codes = np.fromiter(
+        (season_cat.categories.get_loc(s) for s in seasons
+         if s in season_cat.categories), dtype=np.int8)
+    mask_season = np.isin(season_cat.codes.to_numpy(), season_codes)
+    return df_slice[mask_season]
+
+
+# Hand the day x hour profile to the compiled kernel once rows reach this
+# scale; below it, pandas groupby is at breakeven or better
+NUMBA_MIN_ROWS = 200_000
+
+if njit is not None:
+    @njit(cache=True)
+    def _grouped_sum_count(group_idx, counts, n_groups):
+        sums = np.zeros(n_groups, dtype=np.float64)
+        nobs = np.zeros(n_groups, dtype=np.int64)
+        for i in range(group_idx.size):
+            g = group_idx[i]
+            sums[g] += counts[i]
+            nobs[g] += 1
+        return sums, nobs
+
+
+def _day_hour_profile_numba():
+    # Encode (year, season, day, hour) as one flat bucket index and let the
+    # compiled kernel accumulate in a single pass over contiguous arrays
+    years = df['year'].to_numpy()
+    year_base = int(years.min())
+    year_codes = (years - year_base).astype(np.int64)
+    n_years = int(year_codes.max()) + 1
+    season_codes = df['season_label'].cat.codes.to_numpy().astype(np.int64)
+    day_codes = df['day'].cat.codes.to_numpy().astype(np.int64)
+    hours = df['hour'].to_numpy().astype(np.int64)
+    shape = (n_years, len(SEASON_MAP), len(DAY_ORDER), 24)
+    group_idx = ((year_codes * shape[1] + season_codes)
+                 * shape[2] + day_codes) * shape[3] + hours
+    sums, nobs = _grouped_sum_count(
+        group_idx, df['count'].to_numpy(np.float64), int(np.prod(shape)))
+
+    observed = np.nonzero(nobs > 0)[0]
+    y_i, s_i, d_i, h_i = np.unravel_index(observed, shape)
+    index = pd.MultiIndex.from_arrays([
+        y_i + year_base,
+        pd.Categorical.from_codes(s_i.astype('int8'),
+                                  dtype=df['season_label'].dtype),
+        pd.Categorical.from_codes(d_i.astype('int8'), dtype=df['day'].dtype),
+        h_i.astype('int8'),
+    ], names=['year', 'season_label', 'day', 'hour'])
+    return pd.DataFrame(
+        {'sum': sums[observed], 'count': nobs[observed]}, index=index)
+
+
+@st.cache_data
+def precompute_profiles():
+    """Full-dataset sum/count tables carrying the filter axes.
+
+    Computed once; per-filter means for the hottest charts then reduce these
+    few-hundred-row tables instead of re-grouping the raw rows.
+    """
+    filter_keys = ['year', 'season_label']
+    if njit is not None and len(df) >= NUMBA_MIN_ROWS:
+        day_hour = _day_hour_profile_numba()
+    else:
+        day_hour = df.groupby(filter_keys + ['day', 'hour'],
+                              observed=True)['count'].agg(['sum', 'count'])
+    return {
+        'work_trend': df.groupby(filter_keys + ['hour', 'working_day_str'],
+                                 observed=True)['count'].agg(['sum', 'count']),
+        'day_hour': day_hour,
+    }
+
+
+def _profile_mean(profile, years, seasons, keep):
+    idx = profile.index
+    sel = profile[idx.get_level_values('year').isin(years)
+                  & idx.get_level_values('season_label').isin(seasons)]
+    sums = sel.groupby(level=keep, observed=True).sum()
+    return sums['sum'].div(sums['count']).rename('count')
+
+
+@st.cache_data
+def compute_aggregates(years, seasons):
+    """One scan per aggregate over the cached filtered frame, memoized per
+    filter state so revisiting a previous widget combination is free."""
+    df_f = get_filtered(years, seasons)
+    profiles = precompute_profiles()
+
+    # One pass into a 24-slot accumulator beats a groupby for this KPI
+    hour_vals = df_f['hour'].to_numpy()
+    peak_hour = (int(np.bincount(hour_vals,
+                                 weights=df_f['count'].to_numpy(),
+                                 minlength=24).argmax())
+                 if hour_vals.size else 0)
+    return {
+        'total_rides': df_f['count'].sum(),
+        'avg_rides': df_f['count'].mean(),
+        'peak_hour': peak_hour,
+        'user_sums': df_f[['casual', 'registered']].sum(),
+        'monthly_growth': df_f.groupby(['month', 'year'], observed=True)[
+            'count'].mean().reset_index(),
+        'work_trend': _profile_mean(
+            profiles['work_trend'], years, seasons,
+            ['hour', 'working_day_str']).reset_index(),
+        'weather_season': df_f.groupby(
+            ['weather_label', 'season_label'], observed=True)[
+            'count'].mean().reset_index(),
+        'corr': _corr_matrix(df_f),
+        # Reduce the global day x hour profile, then unstack into 2D
+        'heatmap': _profile_mean(profiles['day_hour'], years, seasons,
+                                 ['day', 'hour']).unstack('hour'),
+        'period_counts': df_f.groupby('period', observed=True)[
+            'count'].mean().reset_index(),
+        'temp_density': _temp_density(df_f),
+        'temp_points': (df_f[['temp', 'count', 'season_label']]
+                        if len(df_f) < SCATTER_MAX_POINTS else None),
+    }
+
+
 # --- 3. SIDEBAR INTELLIGENCE ---
 st.sidebar.title("🎮 Control Panel")
 st.sidebar.markdown("Filter the insights below:")
 
 selected_year = st.sidebar.multiselect(
     "Select Year", options=[2011, 2012], default=[2011, 2012])
+season_options = list(df['season_label'].cat.categories)
 selected_season = st.sidebar.multiselect(
-    "Select Season", options=df['season_label'].unique(), default=df['season_label'].unique())
+    "Select Season", options=season_options, default=season_options)
 
-# Filter Engine
-filtered_df = df[
-    (df['year'].isin(selected_year)) &
-    (df['season_label'].isin(selected_season))
-]
+# Filter Engine: one cached pass builds every aggregate the charts need
+aggs = compute_aggregates(tuple(selected_year), tuple(selected_season))
 
 # --- 4. EXECUTIVE SUMMARY (Top KPIs) ---
 st.title("🚲 Washington D.C. Bike Rental Data Dashboard")
 st.markdown("A 360-degree view of growth, usage, and operations.")
 
-col1, col2, col3, col4 = st.columns(4)
-total_rides = filtered_df['count'].sum()
-avg_rides = filtered_df['count'].mean()
-peak_hour = filtered_df.groupby('hour')['count'].sum().idxmax()
-core_user = "Registered" if filtered_df['registered'].sum(
-) > filtered_df['casual'].sum() else "Casual"
+@st.fragment
+def render_kpis(aggs):
+    col1, col2, col3, col4 = st.columns(4)
+    total_rides = aggs['total_rides']
+    avg_rides = aggs['avg_rides']
+    peak_hour = aggs['peak_hour']
+    core_user = "Registered" if aggs['user_sums']['registered'] > aggs[
+        'user_sums']['casual'] else "Casual"
+
+    col1.metric("Total Rides", f"{total_rides:,.0f}", delta="Volume")
+    col2.metric("Avg Hourly Rides", f"{avg_rides:.0f}", delta="Demand")
+    col3.metric("Busiest Hour", f"{peak_hour}:00", delta="Peak Time")
+    col4.metric("Dominant User", core_user, delta="Customer Base")
 
-col1.metric("Total Rides", f"{total_rides:,.0f}", delta="Volume")
-col2.metric("Avg Hourly Rides", f"{avg_rides:.0f}", delta="Demand")
-col3.metric("Busiest Hour", f"{peak_hour}:00", delta="Peak Time")
-col4.metric("Dominant User", core_user, delta="Customer Base")
+
+render_kpis(aggs)
 
 st.markdown("---")
 
 # --- 5. THEMATIC TABS ---
-tab1, tab2, tab3, tab4 = st.tabs([
-    "📈 Growth Overview",
-    "👥 Usage Patterns",
-    "🌍 Environmental Impact",
-    "⏱️ Daily Operations"
-])
+# Each tab renders inside a fragment, so a rerun raised within one chart
+# group re-executes only that fragment instead of the whole script.
+
 
 # === TAB 1: GROWTH OVERVIEW ===
-with tab1:
+@st.fragment
+def render_growth(aggs):
     st.header("Business Growth & Trends")
     st.caption("How is the service performing over time?")
 
     # PLOT 1: Monthly Growth (Year over Year) - Plotly
-    monthly_growth = filtered_df.groupby(['month', 'year'])[
-        'count'].mean().reset_index()
-    fig1 = px.line(
-        monthly_growth, x='month', y='count', color='year', markers=True,
+    # go traces built from arrays skip PX's DataFrame reflection layer
+    monthly_growth = aggs['monthly_growth']
+    fig1 = go.Figure()
+    for year, grp in monthly_growth.groupby('year', observed=True):
+        fig1.add_trace(go.Scatter(
+            x=grp['month'].astype(str), y=grp['count'].to_numpy(),
+            mode='lines+markers', name=str(year), line=dict(width=3)))
+    fig1.update_layout(
         title="<b>Monthly Growth Trajectory (2011 vs 2012)</b>",
-        labels={'count': 'Average Rentals', 'month': 'Month', 'year': 'Year'},
-        template="plotly_white"
+        xaxis_title="Month", yaxis_title="Average Rentals",
+        legend_title="Year", template="plotly_white"
     )
-    fig1.update_traces(line=dict(width=3))
-    st.plotly_chart(fig1, use_container_width=True)
+    st.plotly_chart(downsample_for_display(fig1), use_container_width=True)
 
 # === TAB 2: USAGE PATTERNS ===
-with tab2:
+@st.fragment
+def render_usage(aggs):
     st.header("Understanding the Rider")
     st.caption("Who rides, and when?")
 
@@ -137,7 +458,7 @@ with tab2:
 
     with c1:
         # PLOT 2: User Segmentation - Plotly Donut
-        user_sums = filtered_df[['casual', 'registered']].sum().reset_index()
+        user_sums = aggs['user_sums'].reset_index()
         user_sums.columns = ['User Type', 'Count']
         fig2 = px.pie(
             user_sums, values='Count', names='User Type', hole=0.5,
@@ -148,81 +469,121 @@ with tab2:
 
     with c2:
         # PLOT 3: Working vs Non-Working Trends - Plotly Line
-        work_trend = filtered_df.groupby(['hour', 'working_day_str'])[
-            'count'].mean().reset_index()
-        fig3 = px.line(
-            work_trend, x='hour', y='count', color='working_day_str',
+        work_trend = aggs['work_trend']
+        fig3 = go.Figure()
+        for day_type, grp in work_trend.groupby('working_day_str',
+                                                observed=True):
+            fig3.add_trace(go.Scatter(
+                x=grp['hour'].to_numpy(), y=grp['count'].to_numpy(),
+                mode='lines', name=day_type))
+        fig3.update_layout(
             title="<b>Commuters vs Weekenders: Hourly Demand</b>",
-            labels={'count': 'Avg Rentals', 'working_day_str': 'Day Type'}
+            xaxis_title="hour", yaxis_title="Avg Rentals",
+            legend_title="Day Type"
         )
-        st.plotly_chart(fig3, use_container_width=True)
+        st.plotly_chart(downsample_for_display(fig3), use_container_width=True)
 
 # === TAB 3: ENVIRONMENTAL IMPACT ===
-with tab3:
+@st.fragment
+def render_environment(aggs):
     st.header("Weather & Environmental Factors")
     st.caption("How external conditions affect demand.")
 
     c3, c4 = st.columns(2)
 
     with c3:
-        # PLOT 4: Weather Impact (Seaborn/Matplotlib) - STATIC
+        # PLOT 4: Weather Impact (Seaborn/Matplotlib) - STATIC, cached PNG
         st.subheader("Impact of Weather Conditions")
-        fig4, ax4 = plt.subplots(figsize=(10, 6))
-        sns.barplot(
-            data=filtered_df, x='weather_label', y='count', hue='season_label',
-            palette="viridis", ax=ax4, errorbar=None
-        )
-        ax4.set_ylabel("Total Rentals")
-        ax4.set_xlabel("")
-        ax4.legend(title="Season")
-        sns.despine()
-        st.pyplot(fig4)
+        st.image(weather_bar_png(aggs['weather_season']),
+                 use_container_width=True)
 
     with c4:
-        # PLOT 5: Correlation Matrix (Seaborn) - STATIC
+        # PLOT 5: Correlation Matrix (Seaborn) - STATIC, cached PNG
         st.subheader("Factor Correlation Analysis")
-        corr_cols = filtered_df[[
-            'temp', 'humidity', 'windspeed', 'count', 'casual', 'registered']].corr()
-        fig5, ax5 = plt.subplots(figsize=(10, 6))
-        sns.heatmap(corr_cols, annot=True, cmap="coolwarm", fmt=".2f", ax=ax5)
-        st.pyplot(fig5)
+        st.image(corr_heatmap_png(aggs['corr']), use_container_width=True)
+
+    # PLOT 8: Temperature vs Demand - Plotly
+    # Rasterized server-side so the payload stays O(pixels), not O(rows);
+    # small filter results fall back to real points
+    st.subheader("Temperature vs Demand")
+    if aggs['temp_points'] is not None:
+        fig8 = px.scatter(
+            aggs['temp_points'], x='temp', y='count', color='season_label',
+            opacity=0.5,
+            title="<b>Rentals vs Temperature</b>",
+            labels={'temp': 'Temperature (°C)', 'count': 'Hourly Rentals',
+                    'season_label': 'Season'},
+            template="plotly_white"
+        )
+    else:
+        density, temp_edges, count_edges = aggs['temp_density']
+        fig8 = go.Figure(go.Heatmap(
+            z=density, x=temp_edges, y=count_edges,
+            colorscale="Magma", colorbar=dict(title="Hours")
+        ))
+        fig8.update_layout(
+            title="<b>Rentals vs Temperature (density)</b>",
+            xaxis_title="Temperature (°C)", yaxis_title="Hourly Rentals",
+            template="plotly_white"
+        )
+    st.plotly_chart(fig8, use_container_width=True)
 
 # === TAB 4: DAILY OPERATIONS ===
-with tab4:
+@st.fragment
+def render_operations(aggs):
     st.header("Operational Heatmaps")
     st.caption("Optimizing fleet availability based on hotspots.")
 
     # PLOT 6: Weekly Heatmap - Plotly
-    heatmap_data = filtered_df.groupby(['day', 'hour'])[
-        'count'].mean().reset_index()
-    heatmap_pivot = heatmap_data.pivot(
-        index='day', columns='hour', values='count')
-
-    fig6 = px.imshow(
-        heatmap_pivot,
-        labels=dict(x="Hour of Day", y="Day of Week", color="Avg Demand"),
-        x=heatmap_pivot.columns,
-        y=heatmap_pivot.index,
-        color_continuous_scale="Magma",
+    heatmap_pivot = aggs['heatmap']
+
+    # Plain arrays serialize cheaper than a DataFrame with its index
+    fig6 = go.Figure(go.Heatmap(
+        z=heatmap_pivot.to_numpy(),
+        x=heatmap_pivot.columns.to_numpy(),
+        y=heatmap_pivot.index.astype(str),
+        colorscale="Magma", colorbar=dict(title="Avg Demand")
+    ))
+    fig6.update_layout(
         title="<b>Weekly Demand Heatmap (Where are the hotspots?)</b>",
-        aspect="auto"
+        xaxis_title="Hour of Day", yaxis_title="Day of Week",
+        yaxis_autorange="reversed"  # Monday on top, like px.imshow drew it
     )
     st.plotly_chart(fig6, use_container_width=True)
 
     # PLOT 7: Operational Periods - Plotly Bar
     st.subheader("Shift Analysis")
-    period_counts = filtered_df.groupby('period')['count'].mean().reindex(
-        ['🌅 Morning Rush', '☀️ Mid-Day', '🌇 Evening Rush', '🌙 Night']
-    ).reset_index()
-
-    fig7 = px.bar(
-        period_counts, x='period', y='count', color='count',
-        title="<b>Average Rentals by Operational Shift</b>",
-        color_continuous_scale="Blues",
-        text_auto='.0f'
-    )
+    # Ordered Categorical keeps the shift order; no reindex needed
+    period_counts = aggs['period_counts']
+
+    period_means = period_counts['count'].to_numpy()
+    fig7 = go.Figure(go.Bar(
+        x=period_counts['period'].astype(str), y=period_means,
+        marker=dict(color=period_means, colorscale="Blues", showscale=True,
+                    colorbar=dict(title="count")),
+        text=np.round(period_means), texttemplate='%{text:.0f}'
+    ))
+    fig7.update_layout(title="<b>Average Rentals by Operational Shift</b>",
+                       xaxis_title="period", yaxis_title="count")
     st.plotly_chart(fig7, use_container_width=True)
 
+
+tab1, tab2, tab3, tab4 = st.tabs([
+    "📈 Growth Overview",
+    "👥 Usage Patterns",
+    "🌍 Environmental Impact",
+    "⏱️ Daily Operations"
+])
+
+with tab1:
+    render_growth(aggs)
+with tab2:
+    render_usage(aggs)
+with tab3:
+    render_environment(aggs)
+with tab4:
+    render_operations(aggs)
+
 # --- 6. FOOTER ---
 st.markdown("---")
 st.caption("© 2024 Bike rental Data Team.")